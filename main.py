@@ -3,6 +3,7 @@ import requests
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import json
+import subprocess
 
 
 load_dotenv()
@@ -11,6 +12,10 @@ load_dotenv()
 token = os.getenv("GITHUB_TOKEN")
 pet_first_use = os.getenv("PET_FIRST_USE", "2025-08-25")
 save_file_path = os.getenv("SAVE_FILE_PATH", "pet_save.json")
+publish_commit = os.getenv("PUBLISH_COMMIT", "false").lower() == "true"
+
+# Rendered outputs of this run (path -> content), flushed once by publish_outputs()
+pending_outputs = {}
 
 
 def parse_date_string(date_string):
@@ -68,12 +73,142 @@ def load_pet_save():
     
 def save_pet_data(data):
     try:
-        with open(save_file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        print(f"Saved pet data to {save_file_path}")
+        if stage_output(save_file_path, json.dumps(data, indent=2, ensure_ascii=False)):
+            print(f"Queued pet data for {save_file_path}")
+        else:
+            print(f"Pet data unchanged in {save_file_path}")
     except Exception as ex:
         print(f"Error saving pet data: {ex}")
 
+
+def stage_output(path, content):
+    """Queue a file for publishing, skipping it if its content is unchanged"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                pending_outputs.pop(path, None)
+                return False
+    pending_outputs[path] = content
+    return True
+
+
+def run_git(args, input_data=None, env=None, cwd=None):
+    result = subprocess.run(
+        ["git"] + args,
+        input=input_data,
+        env=env,
+        cwd=cwd,
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        stderr = result.stderr.decode('utf-8', errors='replace').strip()
+        raise RuntimeError(f"git {' '.join(args[:2])} failed with exit code {result.returncode}: {stderr}")
+    return result.stdout.decode('utf-8').strip()
+
+
+def git_top_level():
+    return os.path.realpath(run_git(["rev-parse", "--show-toplevel"]))
+
+
+def repo_relative_path(path, top_level):
+    """Return path relative to the work tree root, rejecting paths outside it"""
+    rel_path = os.path.relpath(os.path.realpath(path), top_level)
+    if rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep) or os.path.isabs(rel_path):
+        raise ValueError(f"Cannot publish {path}: it is outside the work tree {top_level}")
+    return rel_path.replace(os.sep, "/")
+
+
+def commit_outputs(repo_paths, message):
+    """Create a single commit for the given paths using git plumbing.
+
+    Blobs are written straight into the object store and the tree is built in
+    a throwaway index, so the cost is one commit per run regardless of how
+    many files changed. repo_paths maps each pending output to its path
+    relative to the work tree root.
+    """
+    top_level = git_top_level()
+    git_dir = run_git(["rev-parse", "--absolute-git-dir"])
+    index_path = os.path.join(git_dir, "pet-publish.index")
+    env = dict(os.environ, GIT_INDEX_FILE=index_path)
+
+    try:
+        parent = run_git(["rev-parse", "--verify", "-q", "HEAD"])
+    except RuntimeError:
+        parent = None
+
+    try:
+        if parent:
+            run_git(["read-tree", parent], env=env, cwd=top_level)
+        else:
+            run_git(["read-tree", "--empty"], env=env, cwd=top_level)
+
+        index_info = []
+        for path in sorted(repo_paths):
+            blob = run_git(["hash-object", "-w", "--stdin"], input_data=pending_outputs[path].encode('utf-8'))
+            index_info.append(f"100644 {blob}\t{repo_paths[path]}\n")
+        run_git(["update-index", "--index-info"], input_data="".join(index_info).encode('utf-8'), env=env, cwd=top_level)
+
+        tree = run_git(["write-tree"], env=env, cwd=top_level)
+        if parent and tree == run_git(["rev-parse", f"{parent}^{{tree}}"]):
+            return None
+
+        commit_args = ["commit-tree", tree, "-m", message]
+        if parent:
+            commit_args += ["-p", parent]
+        commit = run_git(commit_args)
+
+        update_ref_args = ["update-ref", "-m", "pet publish", "HEAD", commit]
+        if parent:
+            update_ref_args.append(parent)
+        run_git(update_ref_args)
+
+        # Keep the real index in step with the new HEAD for the published paths.
+        # The commit already exists at this point, so a failure here is only a warning.
+        try:
+            run_git(["update-index", "--add", "--"] + list(repo_paths.values()), cwd=top_level)
+        except RuntimeError as e:
+            print(f"Committed {commit[:7]}, but could not sync the index: {e}")
+        return commit
+    finally:
+        if os.path.exists(index_path):
+            os.remove(index_path)
+
+
+def publish_outputs():
+    """Write changed outputs to disk and optionally commit them all at once.
+
+    Errors are not caught here: a failed write or commit must fail the run,
+    otherwise the day's pet state is silently lost.
+    """
+    if not pending_outputs:
+        print("No changes to publish")
+        return None
+
+    paths = sorted(pending_outputs)
+
+    # Validate commit paths before touching the work tree
+    repo_paths = None
+    if publish_commit:
+        top_level = git_top_level()
+        repo_paths = {path: repo_relative_path(path, top_level) for path in paths}
+
+    for path in paths:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(pending_outputs[path])
+    print(f"Wrote {len(paths)} changed file(s): {', '.join(paths)}")
+
+    commit = None
+    if publish_commit:
+        message = f"🐾 Daily pet update - {today.strftime('%Y-%m-%d')}"
+        commit = commit_outputs(repo_paths, message)
+        if commit:
+            print(f"Committed {len(paths)} file(s) as {commit[:7]}")
+        else:
+            print("No changes to commit")
+
+    pending_outputs.clear()
+    return commit
+
   
 def make_graphql_request():
     if not token:
@@ -503,11 +638,11 @@ def update_readme(pet_data):
             # No README exists, create with pet section
             content = status_section
         
-        # Write updated README
-        with open(readme_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-            
-        print("README updated with pet status")
+        # Queue updated README for publishing
+        if stage_output(readme_path, content):
+            print("Queued README update with pet status")
+        else:
+            print("README pet status unchanged")
         return True
         
     except Exception as e:
@@ -659,4 +794,7 @@ def update_pet():
         return None
 
 if __name__ == "__main__":
-    update_pet()
\ No newline at end of file
+    # Write and commit everything that changed in one go, outside update_pet()'s
+    # error handler so a failed publish exits non-zero
+    if update_pet() is not None:
+        publish_outputs()
\ No newline at end of file